@@ -6,68 +6,92 @@ python email_sender.py --zip certificates.zip --csv participants.csv --smtp-serv
 """
 
 import argparse
+import base64
 import csv
+import json
 import os
+import queue
+import random
 import smtplib
 import sys
+import time
+import uuid
 import zipfile
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Dict, List, Tuple
-import re
+from collections.abc import Mapping
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from email.header import Header
+from email.utils import encode_rfc2231
+from typing import Iterable, Iterator, List, Tuple
 from dotenv import load_dotenv
+from util import LATIN1_FALLBACK, MANIFEST_NAME, sanitize_filename, unique_filenames
 
 
-def sanitize_filename(name: str) -> str:
-    if not name or not name.strip():
-        return "participant"
-    s = re.sub(r"\s+", "_", name.strip())
-    s = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "", s)
-    return s[:120] or "participant"
+def iter_participants(csv_path: str) -> Iterator[Tuple[str, str]]:
+    with open(csv_path, 'r', encoding='utf-8', errors=LATIN1_FALLBACK, newline='') as f:
+        for row_idx, row in enumerate(csv.reader(f)):
+            if len(row) >= 2:
+                name = row[0].strip() if row[0] else ""
+                email = row[1].strip() if row[1] else ""
+                if name and email and "@" in email:
+                    yield name, email
+                else:
+                    print(f"Warning: Invalid data in row {row_idx + 1}: {row}", file=sys.stderr)
+            elif len(row) == 1 and row[0].strip():
+                print(f"Warning: Missing email for '{row[0].strip()}' in row {row_idx + 1}", file=sys.stderr)
 
 
 def load_participants_with_emails(csv_path: str) -> List[Tuple[str, str]]:
-    participants = []
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-    except UnicodeDecodeError:
-        with open(csv_path, 'r', encoding='latin-1') as f:
-            content = f.read().strip()
-    
-    if not content:
-        return participants
-    
-    lines = content.splitlines()
-    reader = csv.reader(lines)
-    
-    for row_idx, row in enumerate(reader):
-        if len(row) >= 2:
-            name = row[0].strip() if row[0] else ""
-            email = row[1].strip() if row[1] else ""
-            if name and email and "@" in email:
-                participants.append((name, email))
-            else:
-                print(f"Warning: Invalid data in row {row_idx + 1}: {row}", file=sys.stderr)
-        elif len(row) == 1 and row[0].strip():
-            print(f"Warning: Missing email for '{row[0].strip()}' in row {row_idx + 1}", file=sys.stderr)
-    
-    return participants
-
-
-def extract_certificates_from_zip(zip_path: str) -> Dict[str, bytes]:
-    certificates = {}
+    return list(iter_participants(csv_path))
+
+
+def _certificate_key(name: str) -> str:
+    return sanitize_filename(name).casefold()
+
+
+class CertificateArchive(Mapping):
+    def __init__(self, zf: zipfile.ZipFile):
+        self._zf = zf
+        self._entries = {}
+        self.filenames = None
+        if MANIFEST_NAME in zf.namelist():
+            manifest = json.loads(zf.read(MANIFEST_NAME).decode("utf-8"))
+            self.filenames = {name: os.path.splitext(filename)[0]
+                              for name, filename in manifest.items()}
+        for filename in zf.namelist():
+            if filename.endswith('.png'):
+                key = _certificate_key(os.path.splitext(filename)[0])
+                self._entries.setdefault(key, filename)
+
+    def __getitem__(self, key: str) -> bytes:
+        return self._zf.read(self._entries[key])
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@contextmanager
+def open_certificates(zip_path: str) -> Iterator[CertificateArchive]:
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            for filename in zf.namelist():
-                if filename.endswith('.png'):
-                    name_part = os.path.splitext(filename)[0]
-                    certificates[name_part] = zf.read(filename)
+        f = open(zip_path, 'rb', buffering=1 << 20)
     except Exception as e:
-        raise RuntimeError(f"Failed to extract certificates from ZIP: {e}")
+        raise RuntimeError(f"Failed to open certificates ZIP: {e}")
     
-    return certificates
+    try:
+        try:
+            zf = zipfile.ZipFile(f, 'r')
+        except Exception as e:
+            raise RuntimeError(f"Failed to open certificates ZIP: {e}")
+        with zf:
+            yield CertificateArchive(zf)
+    finally:
+        f.close()
 
 
 def load_email_body(body_path: str = "email_body.txt") -> str:
@@ -89,9 +113,50 @@ Jeethan Roche - From VS Code"""
     return default_body
 
 
+_BOUNDARY = f"==={uuid.uuid4().hex}=="
+
+_MESSAGE_HEAD = (
+    "From: {sender}\r\n"
+    "To: {recipient}\r\n"
+    "Subject: {subject}\r\n"
+    "MIME-Version: 1.0\r\n"
+    f"Content-Type: multipart/mixed; boundary=\"{_BOUNDARY}\"\r\n"
+    "\r\n"
+    f"--{_BOUNDARY}\r\n"
+    "Content-Type: text/plain; charset=\"utf-8\"\r\n"
+    "Content-Transfer-Encoding: base64\r\n"
+    "\r\n"
+)
+
+_ATTACHMENT_HEAD = (
+    f"--{_BOUNDARY}\r\n"
+    "Content-Type: image/png\r\n"
+    "Content-Transfer-Encoding: {encoding}\r\n"
+    "Content-Disposition: attachment; {filename}\r\n"
+    "\r\n"
+)
+
+_MESSAGE_TAIL = f"--{_BOUNDARY}--\r\n".encode("ascii")
+_BOUNDARY_BYTES = _BOUNDARY.encode("ascii")
+
+
+def _encode_filename_param(filename: str) -> str:
+    if filename.isascii():
+        return f'filename="{filename}"'
+    return f"filename*={encode_rfc2231(filename, 'utf-8')}"
+
+
+def _encode_header(value: str) -> str:
+    value = " ".join(value.split())
+    if value.isascii():
+        return value
+    return Header(value, "utf-8").encode(linesep="\r\n")
+
+
 def create_email_message(sender_email: str, recipient_email: str, recipient_name: str, 
                         certificate_data: bytes, certificate_filename: str, 
-                        subject: str = None, body_template: str = None) -> MIMEMultipart:
+                        subject: str = None, body_template: str = None,
+                        *, binary: bool = False) -> bytes:
     
     if subject is None:
         subject = f"Your Certificate - {recipient_name}"
@@ -101,29 +166,198 @@ def create_email_message(sender_email: str, recipient_email: str, recipient_name
     
     body = body_template.format(name=recipient_name)
 
-    msg = MIMEMultipart()
-    msg['From'] = sender_email
-    msg['To'] = recipient_email
-    msg['Subject'] = subject
+    head = _MESSAGE_HEAD.format(
+        sender=_encode_header(sender_email),
+        recipient=_encode_header(recipient_email),
+        subject=_encode_header(subject),
+    )
+    attachment_head = _ATTACHMENT_HEAD.format(
+        encoding="binary" if binary else "base64",
+        filename=_encode_filename_param(certificate_filename),
+    )
     
-    msg.attach(MIMEText(body, 'plain'))
+    return b"".join((
+        head.encode("ascii"),
+        base64.encodebytes(body.encode("utf-8")).replace(b"\n", b"\r\n"),
+        attachment_head.encode("ascii"),
+        certificate_data + b"\r\n" if binary
+        else base64.encodebytes(certificate_data).replace(b"\n", b"\r\n"),
+        _MESSAGE_TAIL,
+    ))
+
+
+def _connect_smtp(smtp_server: str, smtp_port: int,
+                  sender_email: str, sender_password: str) -> smtplib.SMTP:
+    server = smtplib.SMTP(smtp_server, smtp_port)
+    server.ehlo()
+    server.starttls()
+    server.ehlo()
+    server.login(sender_email, sender_password)
+    return server
+
+
+def _supports_binarymime(server: smtplib.SMTP) -> bool:
+    return bool(server.has_extn('binarymime') and server.has_extn('chunking'))
+
+
+def _send_raw(server: smtplib.SMTP, from_addr: str, to_addr: str, msg_bytes: bytes,
+              binary: bool = False):
+    code, resp = server.mail(from_addr, ['BODY=BINARYMIME'] if binary else [])
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+    
+    code, resp = server.rcpt(to_addr)
+    if code not in (250, 251):
+        server.rset()
+        raise smtplib.SMTPRecipientsRefused({to_addr: (code, resp)})
+    
+    if binary:
+        server.send(b"BDAT %d LAST\r\n" % len(msg_bytes) + msg_bytes)
+        code, resp = server.getreply()
+    else:
+        code, resp = server.data(msg_bytes)
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPDataError(code, resp)
+
+
+TRANSIENT_SMTP_CODES = {421, 450, 454, 554}
+# Gmail allows about 15 simultaneous SMTP sessions per account and answers
+# extra logins with 421; most other providers are stricter, not looser.
+MAX_SMTP_SESSIONS = 15
+
+
+def _is_transient_smtp_error(exc: Exception) -> bool:
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code in TRANSIENT_SMTP_CODES for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code in TRANSIENT_SMTP_CODES
+    return isinstance(exc, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError))
+
+
+class SmtpPool:
+    def __init__(self, smtp_server: str, smtp_port: int, sender_email: str, sender_password: str,
+                 size: int = 5, messages_per_connection: int = 500, max_retries: int = 3):
+        if size < 1:
+            raise ValueError(f"SMTP pool size must be at least 1, got {size}")
+        if size > MAX_SMTP_SESSIONS:
+            print(f"Warning: Limiting SMTP sessions from {size} to {MAX_SMTP_SESSIONS}", file=sys.stderr)
+            size = MAX_SMTP_SESSIONS
+        self.size = size
+        self.sender_email = sender_email
+        self.messages_per_connection = messages_per_connection
+        self.max_retries = max_retries
+        self._connect_args = (smtp_server, smtp_port, sender_email, sender_password)
+        self._slots = queue.Queue()
+        try:
+            for _ in range(size):
+                self._slots.put(self._connect())
+        except Exception:
+            self.close()
+            raise
+        slot = self._slots.get()
+        self.binarymime = _supports_binarymime(slot[0])
+        self._slots.put(slot)
+
+    def _connect(self) -> list:
+        return [_connect_smtp(*self._connect_args), 0]
+
+    @staticmethod
+    def _close(slot: list):
+        try:
+            slot[0].quit()
+        except Exception:
+            pass
+
+    def send(self, to_addr: str, msg_bytes: bytes, binary: bool = False):
+        slot = self._slots.get()
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    if slot[0] is None:
+                        slot[:] = self._connect()
+                    elif self.messages_per_connection and slot[1] >= self.messages_per_connection:
+                        self._close(slot)
+                        slot[:] = self._connect()
+                    
+                    _send_raw(slot[0], self.sender_email, to_addr, msg_bytes, binary)
+                    slot[1] += 1
+                    return
+                except Exception as e:
+                    if attempt == self.max_retries or not _is_transient_smtp_error(e):
+                        raise
+                    if slot[0] is not None:
+                        self._close(slot)
+                    slot[:] = [None, 0]
+                    time.sleep(2 ** attempt + random.random())
+        finally:
+            self._slots.put(slot)
+
+    def close(self):
+        while not self._slots.empty():
+            slot = self._slots.get_nowait()
+            if slot[0] is not None:
+                self._close(slot)
+
+
+def send_certificate_stream(jobs: Iterable[Tuple[int, str, str, str, bytes]], total: int,
+                            pool: SmtpPool, sender_email: str,
+                            custom_subject: str = None, body_template: str = None) -> Tuple[int, int]:
+    sent_count = 0
+    failed_count = 0
+    pending = {}
+    body_template = body_template or load_email_body()
+    
+    def collect(return_when):
+        nonlocal sent_count, failed_count
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            idx, name, email = pending.pop(future)
+            try:
+                future.result()
+                print(f"[{idx}/{total}] ✓ Sent to {name} ({email})")
+                sent_count += 1
+            except Exception as e:
+                print(f"[{idx}/{total}] ✗ Failed to send to {name} ({email}): {e}", file=sys.stderr)
+                failed_count += 1
     
-    attachment = MIMEApplication(certificate_data, _subtype='png')
-    attachment.add_header('Content-Disposition', 'attachment', filename=certificate_filename)
-    msg.attach(attachment)
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        for idx, name, email, certificate_filename, certificate_data in jobs:
+            try:
+                if len(pending) >= 2 * pool.size:
+                    collect(FIRST_COMPLETED)
+                
+                binary = pool.binarymime and _BOUNDARY_BYTES not in certificate_data
+                msg = create_email_message(
+                    sender_email, email, name, certificate_data, certificate_filename,
+                    custom_subject, body_template, binary=binary
+                )
+                
+                future = executor.submit(pool.send, email, msg, binary)
+                pending[future] = (idx, name, email)
+            except Exception as e:
+                print(f"[{idx}/{total}] ✗ Failed to send to {name} ({email}): {e}", file=sys.stderr)
+                failed_count += 1
+        
+        if pending:
+            collect(ALL_COMPLETED)
     
-    return msg
+    return sent_count, failed_count
 
 
 def send_certificates_via_email(participants: List[Tuple[str, str]], 
-                               certificates: Dict[str, bytes],
+                               certificates: Mapping[str, bytes],
                                smtp_server: str, smtp_port: int,
                                sender_email: str, sender_password: str,
                                custom_subject: str = None, body_template: str = None,
-                               dry_run: bool = False) -> Tuple[int, int]:
+                               dry_run: bool = False,
+                               messages_per_connection: int = 500,
+                               concurrency: int = 5) -> Tuple[int, int]:
     
     sent_count = 0
     failed_count = 0
+    total = len(participants)
     
     if dry_run:
         print("DRY RUN MODE - No emails will be sent")
@@ -131,55 +365,63 @@ def send_certificates_via_email(participants: List[Tuple[str, str]],
     
     try:
         if not dry_run:
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(sender_email, sender_password)
-            print(f"Successfully connected to {smtp_server}")
+            pool = SmtpPool(smtp_server, smtp_port, sender_email, sender_password,
+                            size=concurrency, messages_per_connection=messages_per_connection)
+            print(f"Successfully connected to {smtp_server} ({pool.size} sessions)")
     except Exception as e:
         print(f"ERROR: Failed to connect to SMTP server: {e}", file=sys.stderr)
-        return 0, len(participants)
-    
-    for idx, (name, email) in enumerate(participants, 1):
-        try:
-            sanitized_name = sanitize_filename(name)
-            
-            if sanitized_name in certificates:
-                certificate_data = certificates[sanitized_name]
-                certificate_filename = f"{sanitized_name}.png"
+        return 0, total
+    
+    if isinstance(certificates, CertificateArchive):
+        filenames = certificates.filenames
+    else:
+        certificates = {_certificate_key(stem): data for stem, data in certificates.items()}
+        filenames = None
+    if filenames is None:
+        filenames = unique_filenames(name for name, _ in participants)
+    
+    def lookup_jobs():
+        nonlocal sent_count, failed_count
+        for idx, (name, email) in enumerate(participants, 1):
+            try:
+                sanitized_name = filenames.get(name) or sanitize_filename(name)
+                key = sanitized_name.casefold()
                 
-                if dry_run:
-                    print(f"[{idx}/{len(participants)}] Would send to {name} ({email}) - Certificate: {certificate_filename}")
-                    sent_count += 1
+                if key in certificates:
+                    certificate_filename = f"{sanitized_name}.png"
+                    
+                    if dry_run:
+                        print(f"[{idx}/{total}] Would send to {name} ({email}) - Certificate: {certificate_filename}")
+                        sent_count += 1
+                    else:
+                        yield idx, name, email, certificate_filename, certificates[key]
                 else:
-                    msg = create_email_message(
-                        sender_email, email, name, certificate_data, certificate_filename,
-                        custom_subject, body_template
-                    )
+                    print(f"[{idx}/{total}] ✗ Certificate not found for {name} (looking for: {sanitized_name})", file=sys.stderr)
+                    failed_count += 1
                     
-                    server.send_message(msg)
-                    print(f"[{idx}/{len(participants)}] ✓ Sent to {name} ({email})")
-                    sent_count += 1
-            else:
-                print(f"[{idx}/{len(participants)}] ✗ Certificate not found for {name} (looking for: {sanitized_name})", file=sys.stderr)
+            except Exception as e:
+                print(f"[{idx}/{total}] ✗ Failed to send to {name} ({email}): {e}", file=sys.stderr)
                 failed_count += 1
-                
-        except Exception as e:
-            print(f"[{idx}/{len(participants)}] ✗ Failed to send to {name} ({email}): {e}", file=sys.stderr)
-            failed_count += 1
     
-    if not dry_run:
-        try:
-            server.quit()
-        except Exception:
+    if dry_run:
+        for _ in lookup_jobs():
             pass
+        return sent_count, failed_count
     
-    return sent_count, failed_count
+    try:
+        stream_sent, stream_failed = send_certificate_stream(
+            lookup_jobs(), total, pool, sender_email, custom_subject, body_template
+        )
+    finally:
+        pool.close()
+    
+    return sent_count + stream_sent, failed_count + stream_failed
 
 
 def send_emails(zip_path="certificates.zip", csv_path="participants.csv", 
                 smtp_server="smtp.gmail.com", smtp_port=587, sender_email=None, 
                 sender_password=None, custom_subject=None, body_template=None, 
-                dry_run=False):
+                dry_run=False, concurrency=5):
     
     load_dotenv()
     
@@ -206,21 +448,23 @@ def send_emails(zip_path="certificates.zip", csv_path="participants.csv",
     
     print(f"Loaded {len(participants)} participants with email addresses")
     
-    try:
-        certificates = extract_certificates_from_zip(zip_path)
-    except Exception as e:
-        print(f"ERROR: {e}", file=sys.stderr)
-        return False
-    
-    print(f"Extracted {len(certificates)} certificates from ZIP file")
-    
-    if dry_run:
-        print("\nRunning in DRY RUN mode - no emails will be sent")
-    
-    sent_count, failed_count = send_certificates_via_email(
-        participants, certificates, smtp_server, smtp_port,
-        sender_email, sender_password, custom_subject, body_template, dry_run
-    )
+    with ExitStack() as stack:
+        try:
+            certificates = stack.enter_context(open_certificates(zip_path))
+        except Exception as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return False
+        
+        print(f"Found {len(certificates)} certificates in ZIP file")
+        
+        if dry_run:
+            print("\nRunning in DRY RUN mode - no emails will be sent")
+        
+        sent_count, failed_count = send_certificates_via_email(
+            participants, certificates, smtp_server, smtp_port,
+            sender_email, sender_password, custom_subject, body_template, dry_run,
+            concurrency=concurrency
+        )
     
     print(f"\nEmail Summary:")
     print(f"Successfully sent: {sent_count}")
@@ -234,6 +478,13 @@ def send_emails(zip_path="certificates.zip", csv_path="participants.csv",
     return True
 
 
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description="Send certificates via email to participants")
     parser.add_argument("--zip", required=False, default="certificates.zip", help="Path to certificates ZIP file")
@@ -245,6 +496,7 @@ def main():
     parser.add_argument("--subject", help="Custom email subject")
     parser.add_argument("--body", help="Custom email body")
     parser.add_argument("--dry-run", action="store_true", help="Test run without sending actual emails")
+    parser.add_argument("--concurrency", type=_positive_int, default=5, help="Number of parallel SMTP sessions (default: 5)")
     
     args = parser.parse_args()
     
@@ -268,21 +520,23 @@ def main():
     
     print(f"Loaded {len(participants)} participants with email addresses")
     
-    try:
-        certificates = extract_certificates_from_zip(args.zip)
-    except Exception as e:
-        print(f"ERROR: {e}", file=sys.stderr)
-        sys.exit(1)
-    
-    print(f"Extracted {len(certificates)} certificates from ZIP file")
-    
-    if args.dry_run:
-        print("\nRunning in DRY RUN mode - no emails will be sent")
-    
-    sent_count, failed_count = send_certificates_via_email(
-        participants, certificates, args.smtp_server, args.smtp_port,
-        args.email, args.password, args.subject, args.body, args.dry_run
-    )
+    with ExitStack() as stack:
+        try:
+            certificates = stack.enter_context(open_certificates(args.zip))
+        except Exception as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+        
+        print(f"Found {len(certificates)} certificates in ZIP file")
+        
+        if args.dry_run:
+            print("\nRunning in DRY RUN mode - no emails will be sent")
+        
+        sent_count, failed_count = send_certificates_via_email(
+            participants, certificates, args.smtp_server, args.smtp_port,
+            args.email, args.password, args.subject, args.body, args.dry_run,
+            concurrency=args.concurrency
+        )
     
     print(f"\nEmail Summary:")
     print(f"Successfully sent: {sent_count}")
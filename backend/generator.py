@@ -1,11 +1,34 @@
 import argparse
 import csv
+import hashlib
+import json
+import multiprocessing
 import os
-import re
+import queue
 import sys
+import tempfile
+import threading
 import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageColor, ImageDraw, ImageFont
+from util import LATIN1_FALLBACK, MANIFEST_NAME, put_until_stopped, unique_filenames
+
+# A2 at 600 DPI, above Pillow's ~89.5 Mpx default so high-DPI templates load
+# quietly, but still bounded since templates can be uploaded through the API.
+# Pillow warns above this and refuses images over twice the limit.
+Image.MAX_IMAGE_PIXELS = 9921 * 14031
+
+FONT_PATH = "GoogleSans-Regular.ttf"
+OUTLINE_FILL = (0, 0, 0)
+# Rendering runs from producer and request threads; forking a multi-threaded
+# process can copy a held lock into the child, so start workers without fork.
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+CACHE_DIR = os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                         "certificate-generator")
 
 try:
     import cairosvg
@@ -14,48 +37,25 @@ except Exception:
     CAIROSVG_AVAILABLE = False
 
 
-def sanitize_filename(name: str) -> str:
-    if not name or not name.strip():
-        return "participant"
-    s = re.sub(r"\s+", "_", name.strip())
-    s = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "", s)
-    return s[:120] or "participant"
-
-
 def load_names(path: str):
-    names = []
+    names = {}
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-    except UnicodeDecodeError:
-        with open(path, 'r', encoding='latin-1') as f:
-            content = f.read().strip()
-    
-    if not content:
-        return names
-    
-    lines = content.splitlines()
-    has_comma = any(',' in line for line in lines)
-    
-    if has_comma:
-        try:
-            reader = csv.reader(lines)
-            for row in reader:
-                if row:
-                    for cell in row:
-                        if cell and cell.strip():
-                            names.append(cell.strip())
-                            break
-        except csv.Error:
-            for line in lines:
+        with open(path, 'r', encoding='utf-8', errors=LATIN1_FALLBACK, newline='',
+                  buffering=1 << 20) as f:
+            for row in csv.reader(f):
+                for cell in row:
+                    if cell and cell.strip():
+                        names[cell.strip()] = None
+                        break
+    except csv.Error:
+        names = {}
+        with open(path, 'r', encoding='utf-8', errors=LATIN1_FALLBACK,
+                  buffering=1 << 20) as f:
+            for line in f:
                 if line.strip():
-                    names.append(line.strip())
-    else:
-        for line in lines:
-            if line.strip():
-                names.append(line.strip())
+                    names[line.strip()] = None
     
-    return list(dict.fromkeys(names))
+    return list(names)
 
 
 def render_template_to_png_bytes(template_path: str, width: int = None, height: int = None):
@@ -86,25 +86,171 @@ def render_template_to_png_bytes(template_path: str, width: int = None, height:
             raise RuntimeError(f"Failed to read template file: {str(e)}")
 
 
-def draw_name_on_image(img: Image.Image, name: str, x: int, y: int,
-                       font: ImageFont.FreeTypeFont, fill: str, align: str = "center",
-                       outline: bool = False, outline_width: int = 2):
+def _render_svg_image(template_path: str, width: int = None, height: int = None) -> Image.Image:
+    tree = cairosvg.parser.Tree(url=template_path)
+    surface = cairosvg.surface.PNGSurface(tree, None, 96, output_width=width, output_height=height,
+                                          background_color="white")
+    cairo_surface = surface.cairo
+    cairo_surface.flush()
+    size = (cairo_surface.get_width(), cairo_surface.get_height())
+    return Image.frombuffer("RGB", size, bytes(cairo_surface.get_data()),
+                            "raw", "BGRX", cairo_surface.get_stride(), 1)
+
+
+def _svg_cache_path(template_path: str, width: int = None, height: int = None) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(template_path, "rb") as f:
+        digest.update(f.read())
+    digest.update(f"{width}x{height}".encode())
+    return os.path.join(CACHE_DIR, f"{digest.hexdigest()}.png")
+
+
+def _store_cached_raster(img: Image.Image, cache_path: str):
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            img.save(f, format="PNG", compress_level=1)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Failed to cache template raster: {e}", file=sys.stderr)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _open_template(source) -> Image.Image:
+    try:
+        with Image.open(source) as img:
+            has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+            return img.convert("RGBA" if has_alpha else "RGB")
+    except Exception as e:
+        raise RuntimeError(f"Failed to open template as image: {str(e)}")
+
+
+def render_template_image(template_path: str, width: int = None, height: int = None,
+                          use_cache: bool = True) -> Image.Image:
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"Template file not found: {template_path}")
+    
+    ext = os.path.splitext(template_path)[1].lower()
+    if ext != ".svg":
+        return _open_template(template_path)
+
+    cache_path = _svg_cache_path(template_path, width, height) if use_cache else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            return _open_template(cache_path)
+        except RuntimeError:
+            pass
+
+    img = None
+    if CAIROSVG_AVAILABLE:
+        try:
+            img = _render_svg_image(template_path, width, height)
+        except Exception:
+            pass
+    if img is None:
+        img = _open_template(BytesIO(render_template_to_png_bytes(template_path, width, height)))
+    if cache_path:
+        _store_cached_raster(img, cache_path)
+    return img
+
+
+def _composite_clipped(img: Image.Image, layer: Image.Image, dest):
+    x0, y0 = dest
+    left = max(0, -x0)
+    top = max(0, -y0)
+    right = min(layer.width, img.width - x0)
+    bottom = min(layer.height, img.height - y0)
+    if left >= right or top >= bottom:
+        return None
+    if img.mode == "RGBA":
+        img.alpha_composite(layer, (x0 + left, y0 + top), (left, top, right, bottom))
+    else:
+        if (left, top, right, bottom) != (0, 0) + layer.size:
+            layer = layer.crop((left, top, right, bottom))
+        img.paste(layer, (x0 + left, y0 + top), layer)
+    return (x0 + left, y0 + top, x0 + right, y0 + bottom)
+
+
+def _glyph(font: ImageFont.FreeTypeFont, char: str, stroke_width: int, glyphs: dict):
+    key = (char, stroke_width)
+    glyph = glyphs.get(key)
+    if glyph is None:
+        left, top, right, bottom = font.getbbox(char, stroke_width=stroke_width)
+        size = (max(1, right - left), max(1, bottom - top))
+        fill_mask = Image.new("L", size)
+        ImageDraw.Draw(fill_mask).text((-left, -top), char, font=font, fill=255)
+        stroke_mask = None
+        if stroke_width:
+            stroke_mask = Image.new("L", size)
+            ImageDraw.Draw(stroke_mask).text((-left, -top), char, font=font, fill=255,
+                                             stroke_width=stroke_width, stroke_fill=255)
+        glyph = glyphs[key] = (fill_mask, stroke_mask, left, top, font.getlength(char))
+    return glyph
+
+
+def _glyph_layer(name: str, font: ImageFont.FreeTypeFont, fill: str, stroke_width: int,
+                 glyphs: dict, text_length: float):
+    """Assemble a text layer from cached per-character masks.
+
+    Matches draw.text up to rounding where neighbouring glyph edges overlap.
+    Returns None when the layout would differ: non-ASCII names, or fonts
+    whose layout kerns this name.
+    """
+    if not name.isascii():
+        return None
+    placed = []
+    pen = 0.0
+    for char in name:
+        fill_mask, stroke_mask, left, top, advance = _glyph(font, char, stroke_width, glyphs)
+        placed.append((fill_mask, stroke_mask, round(pen) + left, top))
+        pen += advance
+    if abs(pen - text_length) >= 0.5:
+        return None
+
+    left = min(p[2] for p in placed)
+    top = min(p[3] for p in placed)
+    right = max(p[2] + p[0].width for p in placed)
+    bottom = max(p[3] + p[0].height for p in placed)
+    size = (right - left, bottom - top)
+    fill_all = Image.new("L", size)
+    stroke_all = Image.new("L", size) if stroke_width else None
+    for fill_mask, stroke_mask, gx, gy in placed:
+        box = (gx - left, gy - top, gx - left + fill_mask.width, gy - top + fill_mask.height)
+        fill_all.paste(ImageChops.screen(fill_all.crop(box), fill_mask), box)
+        if stroke_all is not None:
+            stroke_all.paste(ImageChops.screen(stroke_all.crop(box), stroke_mask), box)
+
+    layer = Image.new("RGBA", size, (0, 0, 0, 0))
+    if stroke_all is not None:
+        layer.paste(OUTLINE_FILL, mask=stroke_all)
+    layer.paste(fill, mask=fill_all)
+    return layer, left, top
+
+
+def _measure_text(font, text: str):
+    if isinstance(font, ImageFont.FreeTypeFont):
+        ascent, descent = font.getmetrics()
+        return font.getlength(text), ascent + descent
+    if not hasattr(font, "getbbox"):
+        return font.getsize(text)
+    left, top, right, bottom = font.getbbox(text)
+    return right - left, bottom - top
+
+
+def composite_name(img: Image.Image, name: str, x: int, y: int,
+                   font: ImageFont.FreeTypeFont, fill: str, align: str = "center",
+                   outline: bool = False, outline_width: int = 2,
+                   draw: ImageDraw.ImageDraw = None, glyphs: dict = None):
     if not name or not name.strip():
-        return img
+        return None
     
-    draw = ImageDraw.Draw(img)
     name = name.strip()
     
-    try:
-        bbox = draw.textbbox((0, 0), name, font=font)
-        text_w = bbox[2] - bbox[0]
-        text_h = bbox[3] - bbox[1]
-    except Exception:
-        try:
-            text_w, text_h = draw.textsize(name, font=font)
-        except AttributeError:
-            text_w = len(name) * (font.size // 2)
-            text_h = font.size
+    text_length, text_h = _measure_text(font, name)
+    text_w = int(text_length)
     
     if align == "center":
         tx = x - text_w // 2
@@ -117,51 +263,177 @@ def draw_name_on_image(img: Image.Image, name: str, x: int, y: int,
     tx = max(0, min(tx, img.width - text_w))
     ty = max(0, min(ty, img.height - text_h))
     
-    if outline and outline_width > 0:
-        for ox in range(-outline_width, outline_width + 1):
-            for oy in range(-outline_width, outline_width + 1):
-                if ox == 0 and oy == 0:
-                    continue
-                try:
-                    draw.text((tx + ox, ty + oy), name, font=font, fill="black")
-                except Exception:
-                    pass
+    stroke_width = outline_width if outline and outline_width > 0 else 0
     
+    if glyphs is not None and isinstance(font, ImageFont.FreeTypeFont):
+        try:
+            cached = _glyph_layer(name, font, fill, stroke_width, glyphs, text_length)
+        except (AttributeError, TypeError):
+            cached = None
+        if cached is not None:
+            layer, left, top = cached
+            return _composite_clipped(img, layer, (tx + left, ty + top))
+
     try:
-        draw.text((tx, ty), name, font=font, fill=fill)
+        left, top, right, bottom = font.getbbox(name, stroke_width=stroke_width)
+        layer = Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+        ImageDraw.Draw(layer).text((-left, -top), name, font=font, fill=fill,
+                                   stroke_width=stroke_width, stroke_fill=OUTLINE_FILL)
+    except (AttributeError, TypeError):
+        pass
     except Exception as e:
         print(f"Warning: Failed to draw text '{name}': {e}", file=sys.stderr)
+        return None
+    else:
+        return _composite_clipped(img, layer, (tx + left, ty + top))
     
+    draw = draw or ImageDraw.Draw(img)
+    ink, outline_ink = fill, OUTLINE_FILL
+    if img.mode == "L" and isinstance(fill, tuple):
+        ink, outline_ink = fill[0], OUTLINE_FILL[0]
+    try:
+        draw.text((tx, ty), name, font=font, fill=ink,
+                  stroke_width=stroke_width, stroke_fill=outline_ink)
+    except Exception as e:
+        print(f"Warning: Failed to draw text '{name}': {e}", file=sys.stderr)
+    
+    return (0, 0, img.width, img.height)
+
+
+def draw_name_on_image(img: Image.Image, name: str, x: int, y: int,
+                       font: ImageFont.FreeTypeFont, fill: str, align: str = "center",
+                       outline: bool = False, outline_width: int = 2,
+                       draw: ImageDraw.ImageDraw = None):
+    composite_name(img, name, x, y, font, fill, align, outline, outline_width, draw)
     return img
 
 
-def generate_certificates(template_path="template.png", participants_path="participants.csv", 
-                         x=None, y=None, fontsize=90, color="#000000", outline=False, dpi=600):
-    font_path = "GoogleSans-Regular.ttf"
-    output_zip = "certificates.zip"
+def _is_grayscale(img: Image.Image) -> bool:
+    if img.mode == "L":
+        return True
+    if img.mode != "RGB":
+        return False
+    r, g, b = img.split()
+    return ImageChops.difference(r, g).getbbox() is None and ImageChops.difference(g, b).getbbox() is None
+
+
+@lru_cache(maxsize=4)
+def _load_template(path: str, mtime: float, use_cache: bool = True):
+    base_img = render_template_image(path, use_cache=use_cache)
+    if base_img.mode == "RGB" and _is_grayscale(base_img):
+        base_img = base_img.convert("L")
+    return base_img.mode, base_img.size, base_img.tobytes()
+
+
+@lru_cache(maxsize=16)
+def _load_font(path: str, size: int, mtime: float):
+    return ImageFont.truetype(path, size)
 
-    for path, name in [(template_path, "template"), (participants_path, "participants file"), (font_path, "font file")]:
+
+_worker_base_img = None
+_worker_canvas = None
+_worker_draw = None
+_worker_font = None
+_worker_glyphs = None
+_worker_dirty = None
+
+
+def _init_worker(template, font_path: str, fontsize: int):
+    global _worker_base_img, _worker_canvas, _worker_draw, _worker_font, _worker_glyphs
+    _worker_base_img = Image.frombytes(*template)
+    _worker_canvas = _worker_base_img.copy()
+    _worker_draw = ImageDraw.Draw(_worker_canvas)
+    try:
+        _worker_font = _load_font(font_path, fontsize, os.path.getmtime(font_path))
+    except Exception:
+        _worker_font = ImageFont.load_default()
+    _worker_glyphs = {}
+
+
+def _render_one(name: str, out_filename: str, x: int, y: int, fill, outline: bool, dpi: int):
+    global _worker_dirty
+    if _worker_dirty:
+        _worker_canvas.paste(_worker_base_img.crop(_worker_dirty), _worker_dirty)
+    _worker_dirty = composite_name(_worker_canvas, name, x, y, _worker_font, fill,
+                                   align="center", outline=outline, draw=_worker_draw,
+                                   glyphs=_worker_glyphs)
+
+    img_bytes = BytesIO()
+    _worker_canvas.save(img_bytes, format="PNG", compress_level=1, dpi=(dpi, dpi))
+    return out_filename, img_bytes.getvalue()
+
+
+def iter_rendered_certificates(names, template, font_path: str, fontsize: int,
+                               x: int, y: int, color: str = "#000000", outline: bool = False,
+                               dpi: int = 600, workers: int = None):
+    workers = workers or os.cpu_count() or 1
+    names = list(names)
+    filenames = unique_filenames(names)
+    fill = ImageColor.getrgb(color)
+    if template[0] == "L" and len(set(fill[:3])) > 1:
+        template = ("RGB", template[1], Image.frombytes(*template).convert("RGB").tobytes())
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT, initializer=_init_worker,
+                             initargs=(template, font_path, fontsize)) as executor:
+        pending = deque()
+        for name in names:
+            pending.append((name, executor.submit(_render_one, name, f"{filenames[name]}.png",
+                                                  x, y, fill, outline, dpi)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+def prepare_template(template_path: str = "template.png", x: int = None, y: int = None,
+                     fontsize: int = 90, font_path: str = FONT_PATH, use_cache: bool = True):
+    for path, name in [(template_path, "template"), (font_path, "font file")]:
         if not os.path.exists(path):
             print(f"ERROR: {name} not found: {path}", file=sys.stderr)
-            return False
+            return None
 
     try:
-        png_bytes = render_template_to_png_bytes(template_path)
+        template = _load_template(template_path, os.path.getmtime(template_path), use_cache)
     except Exception as e:
         print(f"ERROR: Template processing failed: {e}", file=sys.stderr)
-        return False
-
-    try:
-        base_img = Image.open(BytesIO(png_bytes)).convert("RGBA")
-    except Exception as e:
-        print(f"ERROR: Failed to open template as image: {e}", file=sys.stderr)
-        return False
+        return None
     
-    base_width, base_height = base_img.size
+    base_width, base_height = template[1]
     print(f"Template size: {base_width} x {base_height} pixels")
 
     x_coord = x if x is not None else base_width // 2
     y_coord = y if y is not None else base_height // 2
+    
+    if x_coord < 0 or x_coord >= base_width or y_coord < 0 or y_coord >= base_height:
+        print(f"WARNING: Coordinates ({x_coord}, {y_coord}) may be outside image bounds", file=sys.stderr)
+    
+    try:
+        _load_font(font_path, fontsize, os.path.getmtime(font_path))
+    except Exception as e:
+        print(f"ERROR: Failed to load font: {e}", file=sys.stderr)
+        try:
+            ImageFont.load_default()
+            print("Using default font as fallback", file=sys.stderr)
+        except Exception:
+            print("ERROR: No font available", file=sys.stderr)
+            return None
+    
+    return template, x_coord, y_coord
+
+
+def generate_certificates(template_path="template.png", participants_path="participants.csv", 
+                         x=None, y=None, fontsize=90, color="#000000", outline=False, dpi=600,
+                         workers=None, use_cache=True):
+    output_zip = "certificates.zip"
+
+    if not os.path.exists(participants_path):
+        print(f"ERROR: participants file not found: {participants_path}", file=sys.stderr)
+        return False
+
+    prepared = prepare_template(template_path, x, y, fontsize, use_cache=use_cache)
+    if prepared is None:
+        return False
+    template, x_coord, y_coord = prepared
 
     try:
         names = load_names(participants_path)
@@ -175,49 +447,68 @@ def generate_certificates(template_path="template.png", participants_path="parti
     
     print(f"Loaded {len(names)} names")
     
-    if x_coord < 0 or x_coord >= base_width or y_coord < 0 or y_coord >= base_height:
-        print(f"WARNING: Coordinates ({x_coord}, {y_coord}) may be outside image bounds", file=sys.stderr)
+    out_zip_path = os.path.abspath(output_zip)
+    tmp_zip_path = f"{out_zip_path}.tmp"
+    zip_written = False
+    success_count = 0
+    manifest = {}
+    rendered = queue.Queue(maxsize=2 * (workers or os.cpu_count() or 1))
+    stop = threading.Event()
     
-    try:
-        font = ImageFont.truetype(font_path, fontsize)
-    except Exception as e:
-        print(f"ERROR: Failed to load font: {e}", file=sys.stderr)
+    def produce():
         try:
-            font = ImageFont.load_default()
-            print("Using default font as fallback", file=sys.stderr)
-        except Exception:
-            print("ERROR: No font available", file=sys.stderr)
-            return False
+            certificates = iter_rendered_certificates(names, template, FONT_PATH, fontsize,
+                                                      x_coord, y_coord, color, outline, dpi, workers)
+            for idx, (name, future) in enumerate(certificates, start=1):
+                if stop.is_set():
+                    break
+                try:
+                    out_filename, data = future.result()
+                except Exception as e:
+                    print(f"[{idx}/{len(names)}] ✗ Failed for '{name}': {e}", file=sys.stderr)
+                    continue
+                if not put_until_stopped(rendered, (idx, name, out_filename, data), stop):
+                    break
+        except Exception as e:
+            print(f"ERROR: Certificate rendering failed: {e}", file=sys.stderr)
+        finally:
+            put_until_stopped(rendered, None, stop)
     
-    out_zip_path = os.path.abspath(output_zip)
-    success_count = 0
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
     
     try:
-        with zipfile.ZipFile(out_zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
-            for idx, name in enumerate(names, start=1):
+        with open(tmp_zip_path, "wb", buffering=4 << 20) as raw, \
+                zipfile.ZipFile(raw, "w", compression=zipfile.ZIP_STORED) as zf:
+            for idx, name, out_filename, data in iter(rendered.get, None):
                 try:
-                    safe_name = sanitize_filename(name)
-                    out_filename = f"{safe_name}.png"
-                    
-                    img = base_img.copy()
-                    img = draw_name_on_image(img, name, x_coord, y_coord, font, color, 
-                                           align="center", outline=outline)
-                    
-                    img_bytes = BytesIO()
-                    img.save(img_bytes, format="PNG", optimize=True, dpi=(dpi, dpi))
-                    img_bytes.seek(0)
-                    
-                    zf.writestr(out_filename, img_bytes.read())
+                    zf.writestr(out_filename, data)
+                    manifest[name] = out_filename
                     success_count += 1
                     print(f"[{idx}/{len(names)}] ✓ {out_filename} (name: {name})")
                     
                 except Exception as e:
                     print(f"[{idx}/{len(names)}] ✗ Failed for '{name}': {e}", file=sys.stderr)
                     continue
+            
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+        zip_written = True
                     
     except Exception as e:
         print(f"ERROR: Failed to create ZIP file: {e}", file=sys.stderr)
         return False
+    finally:
+        stop.set()
+        producer.join()
+        if not zip_written and os.path.exists(tmp_zip_path):
+            os.remove(tmp_zip_path)
+
+    try:
+        os.replace(tmp_zip_path, out_zip_path)
+    except OSError as e:
+        print(f"ERROR: Failed to create ZIP file: {e}", file=sys.stderr)
+        os.remove(tmp_zip_path)
+        return False
 
     if success_count == 0:
         print("ERROR: No certificates were generated successfully", file=sys.stderr)
@@ -225,4 +516,40 @@ def generate_certificates(template_path="template.png", participants_path="parti
     
     print(f"Done. Generated {success_count}/{len(names)} certificates")
     print(f"Certificates ZIP created at: {out_zip_path}")
-    return True
\ No newline at end of file
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate certificates from a template and a list of names")
+    parser.add_argument("--template", default="template.png", help="Path to template image (PNG or SVG)")
+    parser.add_argument("--names", default="participants.csv", help="Path to participants CSV or names file")
+    parser.add_argument("--x", type=int, help="X coordinate for name placement")
+    parser.add_argument("--y", type=int, help="Y coordinate for name placement")
+    parser.add_argument("--fontsize", type=int, default=90, help="Font size")
+    parser.add_argument("--color", default="#000000", help="Text color")
+    parser.add_argument("--outline", action="store_true", help="Add text outline")
+    parser.add_argument("--dpi", type=int, default=600, help="DPI for output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of rendering processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-render SVG templates instead of using the on-disk raster cache")
+    
+    args = parser.parse_args()
+    
+    success = generate_certificates(
+        template_path=args.template,
+        participants_path=args.names,
+        x=args.x,
+        y=args.y,
+        fontsize=args.fontsize,
+        color=args.color,
+        outline=args.outline,
+        dpi=args.dpi,
+        workers=args.workers,
+        use_cache=not args.no_cache
+    )
+    
+    if not success:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
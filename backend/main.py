@@ -1,15 +1,29 @@
 import argparse
+import errno
 import sys
 import os
-from flask import Flask, request, jsonify, send_file
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, request, jsonify, send_file, url_for
 from flask_cors import CORS
 import shutil
 from generator import generate_certificates
 from email_sender import send_emails
+from pipeline import generate_and_send
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def move_into_place(src, dst):
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copy(src, dst)
+
 def create_app():
     app = Flask(__name__)
     
@@ -19,6 +33,44 @@ def create_app():
     UPLOAD_FOLDER = 'uploads'
     if not os.path.exists(UPLOAD_FOLDER):
         os.makedirs(UPLOAD_FOLDER)
+    
+    # Generation and sending share certificates.zip and the uploaded files in
+    # the working directory, so only one of them may run at a time.
+    work_lock = threading.Lock()
+    job_executor = ThreadPoolExecutor(max_workers=1)
+    job_ttl = int(os.getenv('JOB_TTL_SECONDS', 3600))
+    jobs = {}
+    jobs_lock = threading.Lock()
+
+    def prune_jobs():
+        cutoff = time.monotonic() - job_ttl
+        expired = [job_id for job_id, (_, finished_at) in jobs.items()
+                   if finished_at is not None and finished_at < cutoff]
+        for job_id in expired:
+            del jobs[job_id]
+
+    def submit_job(fn, **kwargs):
+        job_id = uuid.uuid4().hex
+        with jobs_lock:
+            prune_jobs()
+            jobs[job_id] = ({'status': 'queued'}, None)
+        
+        def run():
+            with jobs_lock:
+                jobs[job_id] = ({'status': 'running'}, None)
+            try:
+                with work_lock:
+                    state = {'status': 'succeeded' if fn(**kwargs) else 'failed'}
+            except Exception as e:
+                state = {'status': 'failed', 'error': str(e)}
+            with jobs_lock:
+                jobs[job_id] = (state, time.monotonic())
+        
+        job_executor.submit(run)
+        return jsonify({
+            'jobId': job_id,
+            'statusUrl': url_for('job_status', job_id=job_id)
+        }), 202
 
     @app.route('/upload-files', methods=['POST'])
     def upload_files():
@@ -44,10 +96,10 @@ def create_app():
                 with open(email_body_path, 'w', encoding='utf-8') as f:
                     f.write(email_body)
             
-            shutil.copy(participants_path, 'participants.csv')
-            shutil.copy(template_path, 'template.png')
+            move_into_place(participants_path, 'participants.csv')
+            move_into_place(template_path, 'template.png')
             if os.path.exists(email_body_path):
-                shutil.copy(email_body_path, 'email_body.txt')
+                move_into_place(email_body_path, 'email_body.txt')
             
             return jsonify({'message': 'Files uploaded successfully'}), 200
             
@@ -65,9 +117,16 @@ def create_app():
             outline = data.get('outline', False)
             dpi = data.get('dpi', 600)
             
-            success = generate_certificates(
-                x=x, y=y, fontsize=fontsize, color=color, outline=outline, dpi=dpi
-            )
+            if data.get('async'):
+                return submit_job(
+                    generate_certificates,
+                    x=x, y=y, fontsize=fontsize, color=color, outline=outline, dpi=dpi
+                )
+            
+            with work_lock:
+                success = generate_certificates(
+                    x=x, y=y, fontsize=fontsize, color=color, outline=outline, dpi=dpi
+                )
             
             if success:
                 return jsonify({'message': 'Certificates generated successfully'}), 200
@@ -94,13 +153,24 @@ def create_app():
                 with open('email_body.txt', 'r', encoding='utf-8') as f:
                     body_template = f.read().strip()
             
-            success = send_emails(
-                sender_email=sender_email,
-                sender_password=sender_password,
-                custom_subject=custom_subject,
-                body_template=body_template,
-                dry_run=dry_run
-            )
+            if data.get('async'):
+                return submit_job(
+                    send_emails,
+                    sender_email=sender_email,
+                    sender_password=sender_password,
+                    custom_subject=custom_subject,
+                    body_template=body_template,
+                    dry_run=dry_run
+                )
+            
+            with work_lock:
+                success = send_emails(
+                    sender_email=sender_email,
+                    sender_password=sender_password,
+                    custom_subject=custom_subject,
+                    body_template=body_template,
+                    dry_run=dry_run
+                )
             
             if success:
                 return jsonify({'message': 'Emails sent successfully'}), 200
@@ -110,6 +180,15 @@ def create_app():
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/jobs/<job_id>', methods=['GET'])
+    def job_status(job_id):
+        with jobs_lock:
+            prune_jobs()
+            job = jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify({'jobId': job_id, **job[0]}), 200
+
     @app.route('/download-certificates', methods=['GET'])
     def download_certificates():
         try:
@@ -145,39 +224,37 @@ def main():
     parser.add_argument("--dry-run", action="store_true", help="Test email sending")
     parser.add_argument("--subject", help="Custom email subject")
     parser.add_argument("--body", help="Custom email body")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of rendering processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-render SVG templates instead of using the on-disk raster cache")
     
     args = parser.parse_args()
     
-    print("Generating certificates...")
-    success = generate_certificates(
+    print("Generating and sending certificates...")
+    success = generate_and_send(
         x=args.x,
         y=args.y,
         fontsize=args.fontsize,
         color=args.color,
         outline=args.outline,
-        dpi=args.dpi
-    )
-    
-    if not success:
-        print("Certificate generation failed")
-        sys.exit(1)
-        
-    print("\nSending emails...")
-    email_success = send_emails(
+        dpi=args.dpi,
         sender_email=args.email,
         sender_password=args.password,
         custom_subject=args.subject,
-        custom_body=args.body,
-        dry_run=args.dry_run
+        body_template=args.body,
+        dry_run=args.dry_run,
+        workers=args.workers,
+        use_cache=not args.no_cache
     )
-        
-    if not email_success:
-        print("Email sending failed")
+    
+    if not success:
+        print("Certificate generation or email sending failed")
         sys.exit(1)
     
     print("\nAll operations completed successfully!")
 
 if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 8080))
-    debug_mode = os.getenv('FLASK_ENV') != 'production'
-    app.run(host='0.0.0.0', port=port, debug=debug_mode)
+    if len(sys.argv) > 1:
+        main()
+    elif os.getenv('FLASK_ENV') != 'production':
+        port = int(os.environ.get('PORT', 8080))
+        app.run(host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,120 @@
+import os
+import queue
+import sys
+import threading
+from typing import List, Tuple
+from dotenv import load_dotenv
+from email_sender import SmtpPool, load_participants_with_emails, send_certificate_stream
+from generator import FONT_PATH, iter_rendered_certificates, prepare_template
+from util import put_until_stopped
+
+
+def certificate_pipeline(participants: List[Tuple[str, str]], smtp_pool: SmtpPool,
+                         sender_email: str, template_path: str = "template.png",
+                         x: int = None, y: int = None, fontsize: int = 90, color: str = "#000000",
+                         outline: bool = False, dpi: int = 600, workers: int = None,
+                         custom_subject: str = None, body_template: str = None,
+                         queue_size: int = 16, use_cache: bool = True) -> Tuple[int, int]:
+    total = len(participants)
+    
+    prepared = prepare_template(template_path, x, y, fontsize, use_cache=use_cache)
+    if prepared is None:
+        return 0, total
+    template, x_coord, y_coord = prepared
+    
+    rendered = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            names = [name for name, _ in participants]
+            certificates = iter_rendered_certificates(names, template, FONT_PATH, fontsize,
+                                                      x_coord, y_coord, color, outline, dpi, workers)
+            for idx, ((name, future), (_, email)) in enumerate(zip(certificates, participants), 1):
+                if stop.is_set():
+                    break
+                try:
+                    out_filename, data = future.result()
+                except Exception as e:
+                    print(f"[{idx}/{total}] ✗ Failed to render certificate for '{name}': {e}", file=sys.stderr)
+                    continue
+                if not put_until_stopped(rendered, (idx, name, email, out_filename, data), stop):
+                    break
+        except Exception as e:
+            print(f"ERROR: Certificate rendering failed: {e}", file=sys.stderr)
+        finally:
+            put_until_stopped(rendered, None, stop)
+    
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    
+    try:
+        if smtp_pool is None:
+            sent_count = 0
+            for idx, name, email, out_filename, _ in iter(rendered.get, None):
+                print(f"[{idx}/{total}] Would send to {name} ({email}) - Certificate: {out_filename}")
+                sent_count += 1
+        else:
+            sent_count, _ = send_certificate_stream(
+                iter(rendered.get, None), total, smtp_pool, sender_email, custom_subject, body_template
+            )
+    finally:
+        stop.set()
+        producer.join()
+    return sent_count, total - sent_count
+
+
+def generate_and_send(csv_path="participants.csv", template_path="template.png",
+                      x=None, y=None, fontsize=90, color="#000000", outline=False, dpi=600,
+                      smtp_server="smtp.gmail.com", smtp_port=587, sender_email=None,
+                      sender_password=None, custom_subject=None, body_template=None,
+                      dry_run=False, concurrency=5, workers=None, use_cache=True):
+    
+    load_dotenv()
+    
+    if sender_password is None:
+        sender_password = os.getenv("APP_PASSWORD")
+    
+    if not os.path.exists(csv_path):
+        print(f"ERROR: CSV file not found: {csv_path}", file=sys.stderr)
+        return False
+    
+    try:
+        participants = load_participants_with_emails(csv_path)
+    except Exception as e:
+        print(f"ERROR: Failed to load participants: {e}", file=sys.stderr)
+        return False
+    
+    if not participants:
+        print("ERROR: No valid participants with emails found in CSV file", file=sys.stderr)
+        return False
+    
+    print(f"Loaded {len(participants)} participants with email addresses")
+    
+    smtp_pool = None
+    if dry_run:
+        print("\nRunning in DRY RUN mode - no emails will be sent")
+    else:
+        try:
+            smtp_pool = SmtpPool(smtp_server, smtp_port, sender_email, sender_password, size=concurrency)
+            print(f"Successfully connected to {smtp_server} ({smtp_pool.size} sessions)")
+        except Exception as e:
+            print(f"ERROR: Failed to connect to SMTP server: {e}", file=sys.stderr)
+            return False
+    
+    try:
+        sent_count, failed_count = certificate_pipeline(
+            participants, smtp_pool, sender_email, template_path,
+            x, y, fontsize, color, outline, dpi, workers,
+            custom_subject, body_template, use_cache=use_cache
+        )
+    finally:
+        if smtp_pool is not None:
+            smtp_pool.close()
+    
+    print(f"\nSummary:")
+    print(f"Successfully sent: {sent_count}")
+    print(f"Failed: {failed_count}")
+    print(f"Total participants: {len(participants)}")
+    
+    return failed_count == 0
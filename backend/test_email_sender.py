@@ -0,0 +1,55 @@
+import io
+import os
+import re
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from email_sender import SmtpPool, create_email_message, send_certificates_via_email
+
+BARE_LF = re.compile(rb"(?<!\r)\n")
+
+
+class CreateEmailMessageTest(unittest.TestCase):
+    def build(self, **kwargs):
+        args = dict(
+            sender_email="sender@example.com",
+            recipient_email="recipient@example.com",
+            recipient_name="Zoë Ñandú",
+            certificate_data=os.urandom(64 * 1024),
+            certificate_filename="Zoë_Ñandú.png",
+            subject="Your certificate of completion for the 2025 workshop, Zoë Ñandú — congratulations",
+            body_template="Dear {name},\n\nPlease find your certificate attached.\n" * 20,
+        )
+        args.update(kwargs)
+        return create_email_message(**args)
+
+    def test_base64_message_has_no_bare_lf(self):
+        msg = self.build()
+        self.assertIsNone(BARE_LF.search(msg))
+        self.assertIn(b"\r\n ", msg.split(b"\r\n\r\n", 1)[0])
+
+    def test_binary_message_has_no_bare_lf_outside_payload(self):
+        data = b"\x89PNG\r\n\x1a\n" + b"\n\r" * 100
+        msg = self.build(certificate_data=data, binary=True)
+        self.assertEqual(msg.count(data), 1)
+        self.assertIsNone(BARE_LF.search(msg.replace(data, b"")))
+
+
+class CertificateLookupTest(unittest.TestCase):
+    def test_plain_mapping_matches_case_insensitively(self):
+        participants = [("Alice Smith", "a@x.com"), ("bob jones", "b@x.com"), ("Carol", "c@x.com")]
+        certificates = {"Alice_Smith": b"png", "Bob_Jones": b"png"}
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            result = send_certificates_via_email(participants, certificates, "localhost", 25,
+                                                 "sender@example.com", "", dry_run=True)
+        self.assertEqual(result, (2, 1))
+
+
+class SmtpPoolTest(unittest.TestCase):
+    def test_rejects_empty_pool_before_connecting(self):
+        with self.assertRaises(ValueError):
+            SmtpPool("203.0.113.1", 25, "sender@example.com", "", size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import codecs
+import queue
+import re
+import threading
+from typing import Dict, Iterable
+
+_WS_RE = re.compile(r"\s+")
+_BAD_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+LATIN1_FALLBACK = "latin-1-fallback"
+MANIFEST_NAME = "manifest.json"
+
+
+def sanitize_filename(name: str) -> str:
+    if not name or not name.strip():
+        return "participant"
+    s = _WS_RE.sub("_", name.strip())
+    s = _BAD_RE.sub("", s)
+    return s[:120] or "participant"
+
+
+def unique_filenames(names: Iterable[str]) -> Dict[str, str]:
+    stems = {}
+    taken = set()
+    for name in names:
+        if name in stems:
+            continue
+        base = sanitize_filename(name)
+        stem = base
+        suffix = 1
+        while stem.casefold() in taken:
+            suffix += 1
+            stem = f"{base[:120 - len(str(suffix)) - 1]}_{suffix}"
+        taken.add(stem.casefold())
+        stems[name] = stem
+    return stems
+
+
+def put_until_stopped(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _latin1_fallback(err: UnicodeDecodeError):
+    return err.object[err.start:err.end].decode("latin-1"), err.end
+
+
+codecs.register_error(LATIN1_FALLBACK, _latin1_fallback)